@@ -74,10 +74,14 @@ def run():
     configure_logging()
 
     # Load user config if provided or default file exists
-    if args.config:
-        load_user_config(args.config)
-    elif os.path.exists(DEFAULT_USER_CONFIG_FILE):
-        load_user_config(DEFAULT_USER_CONFIG_FILE)
+    try:
+        if args.config:
+            load_user_config(args.config)
+        elif os.path.exists(DEFAULT_USER_CONFIG_FILE):
+            load_user_config(DEFAULT_USER_CONFIG_FILE)
+    except ValueError as e:
+        console.print(f"[bold red]{e}[/]")
+        raise SystemExit(1)
 
     # Apply optional port override
     if args.port:
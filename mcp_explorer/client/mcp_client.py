@@ -3,10 +3,11 @@ from typing import List, Dict, Any
 from collections import deque
 from contextlib import AsyncExitStack
 
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 
-from mcp_explorer.core.query_processor import process_query_simple
-from mcp_explorer.server import SSEServerConnection
+from mcp_explorer.config import settings
+from mcp_explorer.core.query_processor import ToolResultCache, process_query_simple
+from mcp_explorer.server import SSEServerConnection, STDIOSpawnPool
 
 logger = logging.getLogger("mcp_explorer.client")
 
@@ -16,10 +17,27 @@ class MCPClient:
         # Initialize Anthropic client and conversation/tool tracking
         self.sessions: Dict[str, Any] = {}
         self.exit_stack = AsyncExitStack()
-        self.anthropic = Anthropic()
+        self.anthropic = AsyncAnthropic()
         self.conversation_history = deque(maxlen=100)
         self.available_tools: List[Dict[str, Any]] = []
         self.tool_servers: Dict[str, Any] = {}
+        # Shared across queries so identical tool calls in later turns hit it
+        self.tool_result_cache = ToolResultCache()
+        self.semantic_cache = None
+        if settings.semantic_cache:
+            from mcp_explorer.core.semantic_cache import SemanticCache
+
+            try:
+                self.semantic_cache = SemanticCache()
+            except ImportError as e:
+                logger.error("Semantic cache disabled: %s", e)
+        self.stdio_pool = None
+        if settings.stdio_pool_size > 0:
+            self.stdio_pool = STDIOSpawnPool(
+                settings.stdio_pool_size,
+                max_idle=settings.stdio_pool_max_idle,
+                idle_timeout=settings.stdio_pool_idle_timeout,
+            )
 
     async def connect_to_server(
         self,
@@ -64,6 +82,8 @@ class MCPClient:
                         "name": t["name"],
                         "description": t["description"],
                         "input_schema": t["input_schema"],
+                        "cacheable": t.get("cacheable", False),
+                        "idempotent": t.get("idempotent", False),
                         "server": server_name,
                     }
                     for t in tools
@@ -99,6 +119,8 @@ class MCPClient:
             if conn:
                 await conn.disconnect()
         self.tool_servers.clear()
+        if self.stdio_pool is not None:
+            await self.stdio_pool.close()
 
     async def process_query(
         self,
@@ -119,6 +141,9 @@ class MCPClient:
             conversation_history=list(self.conversation_history),
             max_tool_calls=max_tool_calls,
             tool_overrides=tool_overrides or [],
+            semantic_cache=self.semantic_cache,
+            summary_client=self.anthropic if settings.summarize_history else None,
+            tool_result_cache=self.tool_result_cache,
         )
         return response
 
@@ -134,8 +159,17 @@ class MCPClient:
             from mcp_explorer.server import STDIOServerConnection
 
             logger.info("Creating STDIO connection to: %s", server_url)
-            connection = STDIOServerConnection()
-            if not await connection.connect(server_url, api_keys, environment_variables):
+            if self.stdio_pool is not None:
+                connection = await self.stdio_pool.acquire(
+                    server_url, api_keys, environment_variables
+                )
+            else:
+                connection = STDIOServerConnection()
+                if not await connection.connect(
+                    server_url, api_keys, environment_variables
+                ):
+                    connection = None
+            if connection is None:
                 logger.error("Failed to connect to STDIO server")
                 return False
             tools = await connection.list_tools()
@@ -148,6 +182,8 @@ class MCPClient:
                         "name": t["name"],
                         "description": t["description"],
                         "input_schema": t["input_schema"],
+                        "cacheable": t.get("cacheable", False),
+                        "idempotent": t.get("idempotent", False),
                         "server": server_name,
                     }
                     for t in tools
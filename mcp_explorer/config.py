@@ -1,5 +1,7 @@
 import logging
 
+import fastjsonschema
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -20,6 +22,32 @@ class Settings(BaseSettings):
     )
     max_tokens: int = 8192
     max_tool_calls: int = 5
+    # Maximum number of tool calls in flight at once against a single MCP server,
+    # shared by all queries
+    max_concurrent_tools: int = 10
+    # Maximum Anthropic API requests in flight at once, across all queries
+    max_concurrent_requests: int = 10
+    # Spare, pre-initialized STDIO server processes kept per command once its
+    # server has disconnected, so that reconnecting is immediate; each spare is
+    # a running process (0 disables the spawn pool)
+    stdio_pool_size: int = 0
+    # Spares beyond that are kept when servers disconnect, for this many seconds
+    stdio_pool_max_idle: int = 4
+    stdio_pool_idle_timeout: float = 300.0
+    # Successful results of tools annotated read-only are reused for identical
+    # calls within this window, until another tool on the same server runs
+    tool_cache_size: int = 256
+    tool_cache_ttl: float = 60.0
+    # Answer near-duplicate queries from a local embedding cache (needs numpy
+    # and sentence-transformers)
+    semantic_cache: bool = False
+    semantic_cache_threshold: float = 0.9
+    # Once history exceeds twice history_max_turns messages, replace all but the
+    # most recent history_max_turns with a summary written by summary_model, to
+    # bound per-turn prompt size
+    summarize_history: bool = False
+    history_max_turns: int = 20
+    summary_model: str = "claude-3-5-haiku-20241022"
 
     # Web interface settings
     dev_url: str = "http://localhost:5173"
@@ -30,6 +58,8 @@ class Settings(BaseSettings):
     log_file: str = "mcp_explorer.log"
     log_level: str = "INFO"
     debug: bool = False
+    # With debug on, log complete API requests instead of just their metadata
+    debug_full_request: bool = False
 
     # Preconfigured MCP servers to auto-connect (name -> command)
     mcp_servers: list[dict[str, str]] = []
@@ -50,6 +80,57 @@ DEFAULT_USER_CONFIG_FILE = "mcp-server.yaml"
 # Raw contents of explorer-config.yaml (or DEFAULT_USER_CONFIG_FILE) if loaded via CLI
 user_config: dict | None = None
 
+# JSON schema for the user config file, compiled once into a validator function
+MCP_CONFIG_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "prompt": {"type": "string"},
+        "initial_message": {"type": "string"},
+        "model": {"type": "string"},
+        "mcp": {
+            "type": ["array", "null"],
+            "items": {
+                "type": "object",
+                "required": ["name"],
+                "properties": {
+                    "name": {"type": "string", "pattern": r"\S"},
+                    "url": {"type": "string", "pattern": r"\S"},
+                    "cmd": {"type": "string", "pattern": r"\S"},
+                    "type": {"type": "string"},
+                    "tools": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": ["name", "description"],
+                            "properties": {
+                                "name": {"type": "string"},
+                                "description": {"type": "string"},
+                            },
+                        },
+                    },
+                    "api_keys": {
+                        "type": ["array", "null"],
+                        "items": {"type": "string"},
+                    },
+                    "environment_variables": {
+                        "type": ["array", "null"],
+                        "items": {
+                            "type": "object",
+                            "required": ["key", "val"],
+                            "properties": {
+                                "key": {"type": "string", "pattern": r"\S"},
+                                "val": {"type": "string"},
+                            },
+                        },
+                    },
+                },
+                "anyOf": [{"required": ["url"]}, {"required": ["cmd"]}],
+            },
+        },
+    },
+}
+_validate_user_config = fastjsonschema.compile(MCP_CONFIG_SCHEMA)
+
 # REPL Configuration
 DEFAULT_REPL_PROMPT = "mcp-explorer> "
 DEFAULT_REPL_ART = "MCP Explorer"
@@ -66,16 +147,18 @@ def configure_logging() -> None:
     console_handler.setLevel(level)
 
     class ColorFormatter(logging.Formatter):
-        """Formatter that highlights WARNING level logs in red."""
+        """Formatter that highlights WARNING logs in red and ERROR logs in bold red."""
 
-        RED = "\033[31m"
         RESET = "\033[0m"
+        COLORS = {
+            logging.WARNING: ("\033[31m", RESET),
+            logging.ERROR: ("\033[31;1m", RESET),
+        }
+        NO_COLOR = ("", "")
 
         def format(self, record):
-            msg = super().format(record)
-            if record.levelno == logging.WARNING:
-                return f"{self.RED}{msg}{self.RESET}"
-            return msg
+            prefix, suffix = self.COLORS.get(record.levelno, self.NO_COLOR)
+            return f"{prefix}{super().format(record)}{suffix}"
 
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     console_handler.setFormatter(ColorFormatter(log_format))
@@ -97,6 +180,13 @@ def load_user_config(path: str) -> None:
     global user_config, settings
     with open(path, "r") as f:
         cfg = yaml.safe_load(f) or {}
+
+    # Validate the whole file in one pass; fails fast on the first bad entry
+    try:
+        _validate_user_config(cfg)
+    except fastjsonschema.JsonSchemaException as e:
+        raise ValueError(f"Invalid config file {path}: {e.message}") from e
+
     user_config = cfg
     logger.info("Loaded user config from %s: %r", path, cfg)
 
@@ -123,81 +213,24 @@ def load_user_config(path: str) -> None:
     if "mcp" in cfg:
         servers: list[dict[str, str | list[dict[str, str]]]] = []
         for entry in cfg.get("mcp") or []:
-            if not isinstance(entry, dict):
-                logger.error("Invalid MCP entry (expected dict), skipping: %r", entry)
-                continue
-            name = entry.get("name")
-            if not isinstance(name, str) or not name.strip():
-                logger.error(
-                    "Missing or invalid 'name' in server entry: %r; skipping", entry
-                )
-                continue
             cmd_or_url = entry.get("url") or entry.get("cmd")
-            if not isinstance(cmd_or_url, str) or not cmd_or_url.strip():
-                logger.error(
-                    "No 'url' or 'cmd' specified for server '%s'; skipping", name
-                )
-                continue
             stype = entry.get(
                 "type",
                 "sse" if cmd_or_url.startswith(("http://", "https://")) else "stdio",
             )
-            tool_list = entry.get("tools", [])
-            if not isinstance(tool_list, list):
-                logger.error(
-                    "Invalid tools list for server '%s': expected list, got %r; using empty list",
-                    name,
-                    tool_list,
-                )
-                tool_list = []
-            # Extract placeholder API key names (list of strings) from config
-            raw_keys = entry.get("api_keys") or []
-            if isinstance(raw_keys, list):
-                key_names = [k for k in raw_keys if isinstance(k, str) and k.strip()]
-            else:
-                logger.error(
-                    "Invalid api_keys for server '%s': expected list, got %r; ignoring",
-                    name,
-                    raw_keys,
-                )
-                key_names = []
-            # Extract placeholder environment variables as list of {key, val} dicts
-            raw_envs = entry.get("environment_variables") or []
-            env_list: list[dict[str, str]] = []
-            if isinstance(raw_envs, list):
-                for item in raw_envs:
-                    if (
-                        isinstance(item, dict)
-                        and isinstance(item.get("key"), str)
-                        and item.get("key").strip()
-                        and isinstance(item.get("val"), str)
-                    ):
-                        env_list.append(
-                            {
-                                "key": item["key"].strip(),
-                                "val": item["val"],
-                            }
-                        )
-                    else:
-                        logger.error(
-                            "Invalid environment_variables entry for server '%s': %r; skipping",
-                            name,
-                            item,
-                        )
-            else:
-                logger.error(
-                    "Invalid environment_variables for server '%s': expected list, got %r; ignoring",
-                    name,
-                    raw_envs,
-                )
             servers.append(
                 {
-                    "name": name,
+                    "name": entry["name"],
                     "url": cmd_or_url,
                     "server_type": stype,
-                    "tools": tool_list,
-                    "api_keys": key_names,
-                    "environment_variables": env_list,
+                    "tools": entry.get("tools", []),
+                    # Placeholder API key names (list of strings)
+                    "api_keys": [k for k in entry.get("api_keys") or [] if k.strip()],
+                    # Placeholder environment variables as list of {key, val} dicts
+                    "environment_variables": [
+                        {"key": item["key"].strip(), "val": item["val"]}
+                        for item in entry.get("environment_variables") or []
+                    ],
                 }
             )
         settings.mcp_servers = servers
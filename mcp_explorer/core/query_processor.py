@@ -5,19 +5,47 @@ A clean, modular implementation for handling LLM interactions with MCP servers.
 Can be dropped into existing codebases with minimal integration effort.
 """
 
+import asyncio
+import atexit
 import json
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Protocol
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
+from anthropic.resources import AsyncMessages
 from mcp_explorer.models import ToolOverride
 import logging
 
 from mcp_explorer.config import settings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from mcp.types import CallToolResult
+except ImportError:
+    CallToolResult = None
+
 logger = logging.getLogger(__name__)
 DEBUG = settings.debug
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallResult:
     """Represents the result of a tool call."""
 
@@ -27,6 +55,78 @@ class ToolCallResult:
     error: Optional[str] = None
 
 
+class ToolResultCache:
+    """LRU cache of successful tool results that expire after a time-to-live."""
+
+    def __init__(
+        self,
+        max_size: int = settings.tool_cache_size,
+        ttl_seconds: float = settings.tool_cache_ttl,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Tuple, Tuple[float, ToolCallResult]] = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[ToolCallResult]:
+        """Return the cached result for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: Tuple, result: ToolCallResult) -> None:
+        """Cache a result, evicting the least recently used entries beyond max_size."""
+        self._entries[key] = (time.monotonic(), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+
+    def clear_server(self, server_name: str) -> None:
+        """Drop the cached results of one server's tools."""
+        stale = [key for key in self._entries if key[0] == server_name]
+        for key in stale:
+            del self._entries[key]
+
+
+class SemanticCacheProtocol(Protocol):
+    """Protocol for response caches keyed by text embeddings."""
+
+    def embed(self, text: str) -> Any:
+        """Return the embedding of the given text."""
+        ...
+
+    def get(
+        self,
+        embedding: Any,
+        threshold: Optional[float] = None,
+        model: Optional[str] = None,
+    ) -> Optional[str]:
+        """Return a cached response from the model similar to the embedding, if any."""
+        ...
+
+    def put(self, embedding: Any, response: str, model: Optional[str] = None) -> None:
+        """Cache a response from the model under the given embedding."""
+        ...
+
+
+def _tool_call_key(tool_name: str, tool_args: Dict[str, Any]) -> Tuple[str, bytes]:
+    """Build a hashable key identifying a tool call by name and canonical arguments."""
+    if orjson is not None:
+        return tool_name, orjson.dumps(
+            tool_args, option=orjson.OPT_SORT_KEYS, default=str
+        )
+    return tool_name, json.dumps(tool_args, sort_keys=True, default=str).encode()
+
+
 class ToolServerProtocol(Protocol):
     """Protocol for tool server connections - adapt this to your existing interface."""
 
@@ -35,36 +135,277 @@ class ToolServerProtocol(Protocol):
         ...
 
 
+def _dumps_line(message: Dict[str, Any]) -> bytes:
+    """Serialize a message as a single JSON line."""
+    if orjson is not None:
+        return orjson.dumps(message, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(message) + "\n").encode()
+
+
+class _LogWriter:
+    """Appends messages to a JSONL file from a background thread."""
+
+    FLUSH_INTERVAL = 1.0
+    FLUSH_EVERY = 64
+
+    def __init__(self, path: str):
+        self.path = path
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stop = object()
+        # Set when the log file cannot be opened; later messages are dropped
+        self._failed = False
+
+    def put(self, message: Dict[str, Any]) -> None:
+        """Queue a message for writing, starting the writer thread on first use."""
+        if self._failed:
+            return
+        if self._thread is None:
+            self._start()
+        self._queue.put_nowait(message)
+
+    def close(self) -> None:
+        """Write out everything queued so far and stop the writer thread."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put_nowait(self._stop)
+            thread.join(timeout=5)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="session-log-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self) -> None:
+        try:
+            log_file = open(self.path, "ab")
+        except OSError as e:
+            logger.error(f"Error opening {self.path}: {str(e)}")
+            self._failed = True
+            # Nothing will write these, so release them
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    return
+
+        with log_file:
+            pending = 0
+            last_flush = time.monotonic()
+            while True:
+                try:
+                    message = self._queue.get(timeout=self.FLUSH_INTERVAL)
+                except queue.Empty:
+                    message = None
+                if message is self._stop:
+                    return
+                if message is not None:
+                    try:
+                        log_file.write(_dumps_line(message))
+                        pending += 1
+                    except Exception as e:
+                        logger.error(f"Error writing to {self.path}: {str(e)}")
+
+                now = time.monotonic()
+                if pending and (
+                    pending >= self.FLUSH_EVERY
+                    or now - last_flush >= self.FLUSH_INTERVAL
+                ):
+                    log_file.flush()
+                    pending = 0
+                    last_flush = now
+
+
+_session_log = _LogWriter("session.log")
+
+
 def log_message_to_file(message: Dict[str, Any]) -> None:
-    """Log a message to the session log file if DEBUG is enabled."""
-    if not DEBUG:
-        return
-    
-    try:
-        with open("session.log", "a") as f:
-            f.write(json.dumps(message, indent=2) + "\n\n")
-    except Exception as e:
-        logger.error(f"Error writing to session.log: {str(e)}")
+    """
+    Log a message to the session log file if DEBUG is enabled.
+
+    The message is written as one JSON line by a background thread, so it must
+    not be mutated after being logged.
+    """
+    if DEBUG:
+        _session_log.put(message)
+
+
+class _AnthropicDispatcher:
+    """Caps the number of Anthropic API requests in flight across all queries."""
+
+    def __init__(self, max_concurrent: int):
+        self.max_concurrent = max_concurrent
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def slot(self) -> asyncio.Semaphore:
+        """Return the semaphore to hold for the duration of one request."""
+        # Created lazily, and again if a new event loop is running
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._loop = loop
+        return self._semaphore
+
+    async def submit(self, anthropic_client, **kwargs):
+        """Call messages.create once a request slot is free."""
+        async with self.slot():
+            if isinstance(anthropic_client.messages, AsyncMessages):
+                return await anthropic_client.messages.create(**kwargs)
+            return await asyncio.to_thread(anthropic_client.messages.create, **kwargs)
+
+
+_dispatcher = _AnthropicDispatcher(settings.max_concurrent_requests)
+
+
+async def _create_message(anthropic_client, **kwargs):
+    """
+    Call messages.create without blocking the event loop.
+
+    Async clients (AsyncAnthropic and friends) are awaited directly; sync clients
+    are run in a worker thread for backward compatibility. At most
+    settings.max_concurrent_requests calls run at once.
+    """
+    return await _dispatcher.submit(anthropic_client, **kwargs)
+
+
+async def _stream_message(
+    anthropic_client, on_tool_use: Optional[Callable[[Any], None]] = None, **kwargs
+):
+    """
+    Stream a message from Claude and return the complete Message.
+
+    on_tool_use is called with each tool_use block as soon as that block has
+    finished streaming, so tools can start running while Claude is still
+    generating. Sync clients fall back to a single non-streaming call.
+    """
+    if not isinstance(anthropic_client.messages, AsyncMessages):
+        response = await _create_message(anthropic_client, **kwargs)
+        if on_tool_use is not None:
+            for content_item in response.content:
+                if content_item.type == "tool_use":
+                    on_tool_use(content_item)
+        return response
+
+    async with _dispatcher.slot():
+        async with anthropic_client.messages.stream(**kwargs) as stream:
+            async for event in stream:
+                if (
+                    on_tool_use is not None
+                    and event.type == "content_block_stop"
+                    and event.content_block.type == "tool_use"
+                ):
+                    on_tool_use(event.content_block)
+            return await stream.get_final_message()
+
+
+# Matches system prompts that already describe the tool call limit
+_TOOL_CALL_LIMIT_RE = re.compile("tool call limit", re.IGNORECASE)
+
+# Marks the end of a prompt prefix that Anthropic may cache between requests
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _system_blocks(system_prompt: str) -> List[Dict[str, Any]]:
+    """Wrap the system prompt in a text block marked as a prompt-cache breakpoint."""
+    return [{"type": "text", "text": system_prompt, "cache_control": CACHE_CONTROL}]
+
+
+def _apply_cache_control(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Return the messages with prompt-cache breakpoints on the last two of them.
+
+    Only the two marked messages (and their final content block) are copied; the
+    conversation history itself is never modified.
+    """
+    marked = list(messages)
+    for index in range(max(len(marked) - 2, 0), len(marked)):
+        message = marked[index]
+        content = message["content"]
+        if not content:
+            continue
+        if isinstance(content, str):
+            content = [{"type": "text", "text": content}]
+        else:
+            content = list(content)
+        content[-1] = {**content[-1], "cache_control": CACHE_CONTROL}
+        marked[index] = {**message, "content": content}
+    return marked
+
+
+def _response_for_log(response) -> Dict[str, Any]:
+    """Create a simplified version of an API response for the session log."""
+    content = []
+    for item in response.content:
+        item_type = item.type
+        content.append(
+            {
+                "type": item_type,
+                "text": item.text if item_type == "text" else None,
+                "tool_use": (
+                    {"id": item.id, "name": item.name, "input": item.input}
+                    if item_type == "tool_use"
+                    else None
+                ),
+            }
+        )
+    return {"id": response.id, "model": response.model, "content": content}
 
 
 class ConversationManager:
     """Handles conversation history management with proper tool call structure."""
 
-    def __init__(self, initial_history: Optional[List[Dict[str, Any]]] = None):
-        """Initialize with optional existing conversation history."""
+    SUMMARY_PROMPT = (
+        "Summarize the following conversation between a user and an AI assistant, "
+        "including any tool calls and their results. Keep every fact, decision "
+        "and open question needed to continue the conversation. Reply with the "
+        "summary only."
+    )
+
+    def __init__(
+        self,
+        initial_history: Optional[List[Dict[str, Any]]] = None,
+        max_turns: int = settings.history_max_turns,
+        summary_client=None,
+    ):
+        """
+        Initialize with optional existing conversation history.
+
+        Args:
+            initial_history: Existing conversation history to continue
+            max_turns: Number of recent messages kept verbatim by summarize_history,
+                which summarizes once the history grows past twice this
+            summary_client: Anthropic client used to summarize older messages;
+                history is never summarized without one
+        """
         self.history: List[Dict[str, Any]] = initial_history or []
+        self.max_turns = max_turns
+        self.summary_client = summary_client
+
+    def _append(self, message: Dict[str, Any]) -> None:
+        """Append a message to the history and log it."""
+        self.history.append(message)
+        if DEBUG:
+            log_message_to_file(message)
+
+    def set_summary_threshold(self, max_turns: int) -> None:
+        """Set how many recent messages are kept verbatim when summarizing."""
+        self.max_turns = max_turns
 
     def add_user_message(self, content: str) -> None:
         """Add a user message to conversation history."""
         message = {"role": "user", "content": content}
-        self.history.append(message)
-        log_message_to_file(message)
+        self._append(message)
 
     def add_assistant_message(self, content: str) -> None:
         """Add an assistant message to conversation history."""
         message = {"role": "assistant", "content": content}
-        self.history.append(message)
-        log_message_to_file(message)
+        self._append(message)
 
     def add_tool_call_message(
         self, tool_name: str, tool_args: Dict[str, Any], tool_id: str
@@ -81,8 +422,7 @@ class ConversationManager:
                 }
             ],
         }
-        self.history.append(message)
-        log_message_to_file(message)
+        self._append(message)
 
     def add_tool_result_message(
         self, tool_id: str, result_content: str, is_error: bool = False
@@ -99,84 +439,286 @@ class ConversationManager:
                 }
             ],
         }
-        self.history.append(message)
-        log_message_to_file(message)
+        self._append(message)
+
+    async def summarize_history(self, model: str = settings.summary_model) -> None:
+        """
+        Replace messages older than the last max_turns with a single summary message.
+
+        Runs only once the history exceeds twice max_turns, so each summary call
+        is followed by at least max_turns new messages before the next one. The
+        cut never separates a tool result from the tool call it answers.
+        """
+        if self.summary_client is None or len(self.history) <= 2 * self.max_turns:
+            return
+
+        cut = len(self.history) - self.max_turns
+        while cut < len(self.history) and self._is_tool_result(self.history[cut]):
+            cut += 1
+        if cut >= len(self.history):
+            return
+
+        transcript = "\n\n".join(
+            f"{message['role']}: "
+            + (
+                message["content"]
+                if isinstance(message["content"], str)
+                else json.dumps(message["content"], default=str)
+            )
+            for message in self.history[:cut]
+        )
+        try:
+            response = await _create_message(
+                self.summary_client,
+                model=model,
+                system=self.SUMMARY_PROMPT,
+                max_tokens=1024,
+                messages=[{"role": "user", "content": transcript}],
+            )
+        except Exception as e:
+            logger.error(f"Error summarizing conversation history: {str(e)}")
+            return
+
+        summary = "\n".join(c.text for c in response.content if c.type == "text")
+        message = {"role": "user", "content": f"<summary>{summary}</summary>"}
+        self.history[:cut] = [message]
+        if DEBUG:
+            log_message_to_file(message)
+
+    @staticmethod
+    def _is_tool_result(message: Dict[str, Any]) -> bool:
+        """Check whether a message carries tool results."""
+        content = message["content"]
+        return isinstance(content, list) and any(
+            isinstance(block, dict) and block.get("type") == "tool_result"
+            for block in content
+        )
 
     def get_messages(self) -> List[Dict[str, Any]]:
         """Get a copy of the conversation history."""
         return self.history.copy()
 
+    def _messages_view(self) -> List[Dict[str, Any]]:
+        """
+        Get the conversation history by reference, without copying.
+
+        Used to build API requests. Callers must treat the list and its messages
+        as read-only and must not hold on to it across appends; use get_messages
+        for a copy that is safe to keep or modify.
+        """
+        return self.history
+
     def get_history(self) -> List[Dict[str, Any]]:
         """Get the raw conversation history (for external access)."""
         return self.history
 
 
+# Result type -> whether it exposes a .content attribute
+_HAS_CONTENT: Dict[type, bool] = {}
+
+
+def _flatten_text_content(content: Any) -> Any:
+    """Join MCP content made only of text items into one string; else return as is."""
+    if isinstance(content, list) and all(
+        getattr(item, "type", None) == "text" for item in content
+    ):
+        return "\n".join(item.text for item in content)
+    return content
+
+
 class ToolManager:
     """Handles tool-related operations."""
 
-    def __init__(self, available_tools: List[Dict], tool_servers: Dict[str, Dict]):
+    def __init__(
+        self,
+        available_tools: List[Dict],
+        tool_servers: Dict[str, Dict],
+        max_concurrent_tools: int = settings.max_concurrent_tools,
+        result_cache: Optional[ToolResultCache] = None,
+    ):
         """
         Initialize with tools and servers.
 
         Args:
-            available_tools: List of tool definitions with 'server' field
-            tool_servers: Dict mapping server names to server info (must have 'connection' key)
+            available_tools: List of tool definitions with 'server' field; only
+                tools with "cacheable": True (read-only) have their results
+                cached, and identical calls in one batch share a result only for
+                tools with "idempotent": True
+            tool_servers: Dict mapping server names to server info (must have
+                'connection' key); a 'semaphore' key is added to each server's
+                info on first use, so the limit holds across queries sharing it
+            max_concurrent_tools: Maximum number of concurrent tool calls per server
+            result_cache: Tool result cache to share across queries; a private
+                one is created if omitted
         """
-        self.available_tools = available_tools
+        self._available_tools = available_tools
         self.tool_servers = tool_servers
+        self.max_concurrent_tools = max_concurrent_tools
+        self.result_cache = (
+            result_cache if result_cache is not None else ToolResultCache()
+        )
+        self.invalidate()
 
-    def clean_tools_for_api(self) -> List[Dict[str, Any]]:
-        """Remove server field from tools for Anthropic API."""
-        return [
-            {
-                "name": tool["name"],
-                "description": tool["description"],
-                "input_schema": tool["input_schema"],
-            }
-            for tool in self.available_tools
-        ]
+    @property
+    def available_tools(self) -> List[Dict]:
+        """Tool definitions; assigning a new list rebuilds the lookup indexes."""
+        return self._available_tools
+
+    @available_tools.setter
+    def available_tools(self, tools: List[Dict]) -> None:
+        self._available_tools = tools
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """
+        Rebuild the tool lookup indexes.
+
+        Called automatically when available_tools is reassigned; call it directly
+        after changing available_tools or tool_servers in place.
+        """
+        tool_servers = self.tool_servers
+        self._cacheable_tools = set()
+        self._idempotent_tools = set()
+        # Tool name -> server name; the first server listing a name wins
+        self._tool_to_server: Dict[str, Optional[str]] = {}
+        # Tool name -> (server name, server info) for tools on connected servers
+        self._tool_to_connection: Dict[str, Tuple[str, Dict]] = {}
+        for tool in self.available_tools:
+            name = tool["name"]
+            server_name = tool.get("server")
+            if tool.get("cacheable") is True:
+                self._cacheable_tools.add(name)
+            if tool.get("idempotent") is True:
+                self._idempotent_tools.add(name)
+            self._tool_to_server.setdefault(name, server_name)
+            if server_name in tool_servers:
+                self._tool_to_connection.setdefault(
+                    name, (server_name, tool_servers[server_name])
+                )
+        # Rebuilt only after an override changes a tool description
+        self._clean_tools_cache: Optional[Tuple[Dict[str, Any], ...]] = None
+        self.clean_tools_for_api()
+
+    def clean_tools_for_api(self) -> Sequence[Dict[str, Any]]:
+        """
+        Remove server field from tools for Anthropic API.
+
+        The same tuple is returned on every call so it can be shared across API
+        requests; callers must not mutate it.
+        """
+        if self._clean_tools_cache is None:
+            self._clean_tools_cache = tuple(
+                {
+                    "name": tool["name"],
+                    "description": tool["description"],
+                    "input_schema": tool["input_schema"],
+                }
+                for tool in self.available_tools
+            )
+        return self._clean_tools_cache
+
+    def is_cacheable(self, tool_name: str) -> bool:
+        """Whether the tool's results may be reused by later identical calls."""
+        return tool_name in self._cacheable_tools
+
+    def is_idempotent(self, tool_name: str) -> bool:
+        """Whether identical calls of the tool made together may share one result."""
+        return tool_name in self._idempotent_tools
 
     def find_server_for_tool(self, tool_name: str) -> Optional[str]:
         """Find which server hosts the given tool."""
-        for tool in self.available_tools:
-            if tool["name"] == tool_name:
-                return tool.get("server")
-        return None
-    
+        return self._tool_to_server.get(tool_name)
+
     def apply_override(self, server: str, tool_name: str, description: str) -> None:
         """Override a tool's description for a specific server."""
         for tool in self.available_tools:
             if tool.get("server") == server and tool.get("name") == tool_name:
                 tool["description"] = description
+                self._clean_tools_cache = None
 
     async def execute_tool_call(
         self, tool_name: str, tool_args: Dict
     ) -> ToolCallResult:
         """Execute a tool call and return the result."""
-        server_name = self.find_server_for_tool(tool_name)
-
-        if not server_name or server_name not in self.tool_servers:
+        route = self._tool_to_connection.get(tool_name)
+        if route is None:
             return ToolCallResult(
                 tool_name=tool_name,
                 success=False,
                 content="",
                 error=f"Tool {tool_name} not found in any connected server",
             )
+        server_name, server_info = route
+
+        cache_key = None
+        if tool_name in self._cacheable_tools:
+            cache_key = (server_name, *_tool_call_key(tool_name, tool_args))
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        else:
+            # Any other tool may change the server's state, so cached reads go stale
+            self.result_cache.clear_server(server_name)
+
+        # Kept with the server info so every query using the server shares it
+        sem = server_info.get("semaphore")
+        if sem is None:
+            sem = server_info["semaphore"] = asyncio.Semaphore(
+                self.max_concurrent_tools
+            )
 
         try:
-            connection = self.tool_servers[server_name]["connection"]
-            result = await connection.call_tool(tool_name, tool_args)
-
-            # Handle different result formats - adapt this to your result structure
-            content = getattr(result, "content", str(result))
-
-            return ToolCallResult(tool_name=tool_name, success=True, content=content)
+            async with sem:
+                result = await server_info["connection"].call_tool(
+                    tool_name, tool_args
+                )
         except Exception as e:
+            if cache_key is None:
+                self.result_cache.clear_server(server_name)
             logger.error(f"Error executing tool {tool_name}: {str(e)}")
             return ToolCallResult(
                 tool_name=tool_name, success=False, content="", error=str(e)
             )
 
+        # Handle different result formats - adapt this to your result structure
+        result_type = type(result)
+        if result_type is CallToolResult:
+            content = _flatten_text_content(result.content)
+        else:
+            has_content = _HAS_CONTENT.get(result_type)
+            if has_content is None:
+                has_content = _HAS_CONTENT[result_type] = hasattr(result, "content")
+            content = result.content if has_content else str(result)
+
+        tool_result = ToolCallResult(tool_name=tool_name, success=True, content=content)
+        if cache_key is None:
+            # Also drop reads that completed while this call was running
+            self.result_cache.clear_server(server_name)
+        elif not getattr(result, "isError", False):
+            # Errors reported by the tool itself are never reused
+            self.result_cache.put(cache_key, tool_result)
+        return tool_result
+
+
+# Structured concurrency for tool calls on Python 3.11+, gather before that
+_TaskGroup = getattr(asyncio, "TaskGroup", None)
+
+
+async def _isolate_tool_call(tool_name: str, pending: Awaitable) -> ToolCallResult:
+    """
+    Await a tool call, turning any error into a failed result.
+
+    execute_tool_call already handles errors raised by the tool, so anything
+    caught here is a bug in the client and is logged with its traceback.
+    """
+    try:
+        return await pending
+    except Exception as e:
+        logger.exception(f"Unexpected error handling tool {tool_name}: {str(e)}")
+        return ToolCallResult(
+            tool_name=tool_name, success=False, content="", error=str(e)
+        )
+
 
 class ResponseProcessor:
     """Processes Claude API responses and handles tool calls."""
@@ -191,6 +733,72 @@ class ResponseProcessor:
         self.tool_manager = tool_manager
         self.max_tool_calls = max_tool_calls
         self.tool_call_count = 0
+        # Tool calls already started while the initial response was streaming,
+        # keyed by _tool_call_key
+        self._started_tool_calls: Dict[Tuple[str, bytes], asyncio.Task] = {}
+        # History length at the last logged API request
+        self._last_sent_len = 0
+
+    def start_tool_call(self, tool_call) -> None:
+        """Start executing a tool call ahead of process_response."""
+        key = _tool_call_key(tool_call.name, tool_call.input)
+        if key not in self._started_tool_calls:
+            self._started_tool_calls[key] = asyncio.ensure_future(
+                self.tool_manager.execute_tool_call(tool_call.name, tool_call.input)
+            )
+
+    def log_request(
+        self,
+        label: str,
+        model: str,
+        max_tokens: int,
+        system_prompt: Optional[str] = None,
+        tools: Sequence[Dict[str, Any]] = (),
+    ) -> None:
+        """
+        Log an API request to the session log.
+
+        Messages are already logged one by one as they are added, so only request
+        metadata is logged unless DEBUG_FULL_REQUEST is set, in which case the
+        complete request is written out.
+        """
+        messages = self.conversation_manager._messages_view()
+        history_len = len(messages)
+        start = self._last_sent_len if self._last_sent_len <= history_len else 0
+        self._last_sent_len = history_len
+
+        if settings.debug_full_request:
+            log_message_to_file(
+                {
+                    label: {
+                        "model": model,
+                        "system": system_prompt,
+                        "max_tokens": max_tokens,
+                        "messages": list(messages),
+                        "tools": tools,
+                    }
+                }
+            )
+            return
+
+        log_message_to_file(
+            {
+                "request_meta": {
+                    "type": label,
+                    "model": model,
+                    "max_tokens": max_tokens,
+                    "n_messages": history_len,
+                    "n_new_messages": history_len - start,
+                    "n_tools": len(tools),
+                }
+            }
+        )
+
+    def cancel_started_tool_calls(self) -> None:
+        """Cancel tool calls started by start_tool_call that were never consumed."""
+        for task in self._started_tool_calls.values():
+            task.cancel()
+        self._started_tool_calls.clear()
 
     async def process_response(
         self,
@@ -205,30 +813,28 @@ class ResponseProcessor:
         Returns only the final text response, with all tool calls properly stored as messages.
         Supports multiple rounds of tool calls (up to max_tool_calls).
         """
-        text_parts = []
-        tool_calls_made = []
         self.tool_call_count = 0
-        
-        # First pass: collect text content and identify tool calls
-        for content_item in response.content:
-            if content_item.type == "text":
-                text_parts.append(content_item.text)
-            elif content_item.type == "tool_use":
-                tool_calls_made.append(content_item)
-
-        # If there are text parts but also tool calls, add the text as an assistant message
-        if text_parts:
-            text_content = "\n".join(text_parts)
+
+        # Collect text content and identify tool calls
+        content = response.content
+        text_content = "\n".join(
+            content_item.text for content_item in content if content_item.type == "text"
+        )
+        tool_calls_made = [
+            content_item for content_item in content if content_item.type == "tool_use"
+        ]
+
+        # If there is text (with or without tool calls), add it as an assistant message
+        if text_content:
             self.conversation_manager.add_assistant_message(text_content)
 
         # If no tool calls, return the text content
         if not tool_calls_made:
-            return "\n".join(text_parts) if text_parts else ""
+            return text_content
 
-        # Process each tool call separately
-        for tool_call in tool_calls_made:
-            await self._process_single_tool_call(tool_call)
-            self.tool_call_count += 1
+        # Run the tool calls concurrently, then record them in their original order
+        tool_results = await self._execute_tool_calls(tool_calls_made)
+        self._record_tool_results(tool_calls_made, tool_results)
 
         # Continue processing additional tool calls if needed (up to max_tool_calls)
         while self.tool_call_count < self.max_tool_calls:
@@ -238,24 +844,20 @@ class ResponseProcessor:
             )
             
             # Check if the response contains more tool calls
-            new_tool_calls = []
-            has_text_content = False
-            
-            for content_item in intermediate_response.content:
-                if content_item.type == "text":
-                    has_text_content = True
-                    text_parts.append(content_item.text)
-                elif content_item.type == "tool_use":
-                    new_tool_calls.append(content_item)
-            
+            content = intermediate_response.content
+            iter_text_parts = [item.text for item in content if item.type == "text"]
+            new_tool_calls = [item for item in content if item.type == "tool_use"]
+
+            # Record this turn's text on its own, ahead of its tool calls
+            iter_text = "\n".join(iter_text_parts)
+            if iter_text:
+                self.conversation_manager.add_assistant_message(iter_text)
+
             # If no more tool calls, break the loop
             if not new_tool_calls:
-                # If there's text content, add it as the final response
-                if has_text_content:
-                    final_text_parts = [item.text for item in intermediate_response.content if item.type == "text"]
-                    final_text = "\n".join(final_text_parts)
-                    self.conversation_manager.add_assistant_message(final_text)
-                    return final_text
+                # If there's text content, it is the final response
+                if iter_text_parts:
+                    return iter_text
                 break
                 
             # If we're about to hit the max tool calls limit with this batch, 
@@ -265,14 +867,9 @@ class ResponseProcessor:
                 # Truncate the list to only include what we can process
                 new_tool_calls = new_tool_calls[:remaining_calls]
                 
-            # Process the new tool calls
-            for tool_call in new_tool_calls:
-                await self._process_single_tool_call(tool_call)
-                self.tool_call_count += 1
-                
-                # If we've reached the maximum number of tool calls, break but ensure we get a final response
-                if self.tool_call_count >= self.max_tool_calls:
-                    break
+            # Process the new tool calls concurrently, recording them in order
+            tool_results = await self._execute_tool_calls(new_tool_calls)
+            self._record_tool_results(new_tool_calls, tool_results)
         
         # After all tool calls are complete, get Claude's final response
         # If we hit the max_tool_calls limit, make sure to request a summary of findings
@@ -287,17 +884,63 @@ class ResponseProcessor:
         )
         return final_response
 
-    async def _process_single_tool_call(self, tool_call) -> None:
-        """Process a single tool call and add it to conversation history."""
+    async def _execute_tool_calls(
+        self, tool_calls: List[Any]
+    ) -> List[ToolCallResult]:
+        """
+        Execute tool calls concurrently, returning results in the same order.
+
+        Identical calls (same name and arguments) of an idempotent tool run once
+        and share the result; calls already started while streaming are reused.
+        A call that raises is returned as a failed result without cancelling the
+        others; cancellation propagates to every call.
+        """
+        started = self._started_tool_calls
+        tool_manager = self.tool_manager
+        # Index into pending of the first call with each key, for deduplication
+        scheduled: Dict[Tuple[str, bytes], int] = {}
+        pending: List[Tuple[str, Awaitable]] = []
+        slots = []
+        for tool_call in tool_calls:
+            name, args = tool_call.name, tool_call.input
+            key = _tool_call_key(name, args)
+            slot = scheduled.get(key) if tool_manager.is_idempotent(name) else None
+            if slot is None:
+                call = started.pop(key, None)
+                if call is None:
+                    call = tool_manager.execute_tool_call(name, args)
+                slot = scheduled[key] = len(pending)
+                pending.append((name, call))
+            slots.append(slot)
+        self.cancel_started_tool_calls()
+
+        isolated = [_isolate_tool_call(name, call) for name, call in pending]
+        if _TaskGroup is not None:
+            async with _TaskGroup() as task_group:
+                tasks = [task_group.create_task(coro) for coro in isolated]
+            results = [task.result() for task in tasks]
+        else:
+            results = await asyncio.gather(*isolated)
+        return [results[slot] for slot in slots]
+
+    def _record_tool_results(
+        self, tool_calls: List[Any], tool_results: List[ToolCallResult]
+    ) -> None:
+        """Record executed tool calls in their original order and count them."""
+        record = self._record_tool_call
+        for tool_call, tool_result in zip(tool_calls, tool_results):
+            record(tool_call, tool_result)
+        self.tool_call_count += len(tool_calls)
+
+    def _record_tool_call(self, tool_call, tool_result: ToolCallResult) -> None:
+        """Add a tool call and its result to conversation history."""
         tool_name = tool_call.name
-        tool_args = tool_call.input
         tool_id = tool_call.id
 
         # Add the tool call to conversation history
-        self.conversation_manager.add_tool_call_message(tool_name, tool_args, tool_id)
-
-        # Execute the tool call
-        tool_result = await self.tool_manager.execute_tool_call(tool_name, tool_args)
+        self.conversation_manager.add_tool_call_message(
+            tool_name, tool_call.input, tool_id
+        )
 
         # Add the tool result to conversation history
         if tool_result.success:
@@ -314,43 +957,31 @@ class ResponseProcessor:
         self, anthropic_client, system_prompt: str, model: str, max_tokens: int
     ):
         """Get Claude's intermediate response to check for more tool calls."""
-        messages = self.conversation_manager.get_messages()
+        messages = self.conversation_manager._messages_view()
+        # Get the clean tools for the API call
+        clean_tools = self.tool_manager.clean_tools_for_api()
+        if DEBUG:
+            self.log_request(
+                "intermediate_request", model, max_tokens, system_prompt, clean_tools
+            )
 
         try:
-            # Get the clean tools for the API call
-            clean_tools = self.tool_manager.clean_tools_for_api()
-            
             # Make the API call with tools enabled
-            response = anthropic_client.messages.create(
+            response = await _create_message(
+                anthropic_client,
                 model=model,
-                system=system_prompt,
+                system=_system_blocks(system_prompt),
                 max_tokens=max_tokens,
-                messages=messages,
+                messages=_apply_cache_control(messages),
                 tools=clean_tools,
             )
             
             # Log the intermediate response if in debug mode
             if DEBUG:
                 try:
-                    response_dict = {
-                        "intermediate_response": {
-                            "id": response.id,
-                            "model": response.model,
-                            "content": [
-                                {
-                                    "type": item.type,
-                                    "text": item.text if hasattr(item, "text") else None,
-                                    "tool_use": {
-                                        "id": item.id,
-                                        "name": item.name,
-                                        "input": item.input
-                                    } if hasattr(item, "name") else None
-                                }
-                                for item in response.content
-                            ]
-                        }
-                    }
-                    log_message_to_file(response_dict)
+                    log_message_to_file(
+                        {"intermediate_response": _response_for_log(response)}
+                    )
                 except Exception as e:
                     logger.error(f"Error logging intermediate API response: {str(e)}")
             
@@ -365,23 +996,25 @@ class ResponseProcessor:
         self, anthropic_client, system_prompt: str, model: str, max_tokens: int
     ) -> str:
         """Get Claude's final response after all tool calls are complete."""
-        messages = self.conversation_manager.get_messages()
+        messages = self.conversation_manager._messages_view()
+        if DEBUG:
+            self.log_request("final_request", model, max_tokens, system_prompt)
 
         try:
-            response = anthropic_client.messages.create(
+            response = await _stream_message(
+                anthropic_client,
                 model=model,
-                system=system_prompt,
+                system=_system_blocks(system_prompt),
                 max_tokens=max_tokens,
-                messages=messages,
+                messages=_apply_cache_control(messages),
             )
 
             # Extract text content from the response
-            final_text_parts = []
-            for content_item in response.content:
-                if content_item.type == "text":
-                    final_text_parts.append(content_item.text)
-
-            final_text = "\n".join(final_text_parts)
+            final_text = "\n".join(
+                content_item.text
+                for content_item in response.content
+                if content_item.type == "text"
+            )
 
             # Add Claude's final response to conversation history
             if final_text:
@@ -412,6 +1045,10 @@ class QueryProcessor:
         existing_conversation: Optional[List[Dict]] = None,
         max_tool_calls: int = settings.max_tool_calls,
         tool_overrides: Optional[List[ToolOverride]] = None,
+        max_concurrent_tools: int = settings.max_concurrent_tools,
+        semantic_cache: Optional[SemanticCacheProtocol] = None,
+        summary_client=None,
+        tool_result_cache: Optional[ToolResultCache] = None,
     ):
         """
         Initialize the query processor.
@@ -422,14 +1059,24 @@ class QueryProcessor:
             tool_servers: Dict of server name -> server info with 'connection'
             existing_conversation: Optional existing conversation history to continue
             max_tool_calls: Maximum number of tool calls to make in a single query (default: 5)
+            tool_overrides: Optional server/tool description overrides
+            max_concurrent_tools: Maximum number of concurrent tool calls per server (default: 10)
+            semantic_cache: Optional cache answering near-duplicate queries without an API call
+            summary_client: Optional Anthropic client used to summarize old history
+            tool_result_cache: Optional tool result cache shared across queries
         """
         self.anthropic = anthropic_client
-        self.conversation_manager = ConversationManager(existing_conversation)
-        self.tool_manager = ToolManager(available_tools, tool_servers)
+        self.conversation_manager = ConversationManager(
+            existing_conversation, summary_client=summary_client
+        )
+        self.tool_manager = ToolManager(
+            available_tools, tool_servers, max_concurrent_tools, tool_result_cache
+        )
         self.response_processor = ResponseProcessor(
             self.conversation_manager, self.tool_manager, max_tool_calls
         )
         self.tool_overrides = tool_overrides or []
+        self.semantic_cache = semantic_cache
 
     def get_conversation_history(self) -> List[Dict[str, Any]]:
         """Get the current conversation history."""
@@ -458,6 +1105,18 @@ class QueryProcessor:
         Returns:
             Final text response from Claude (tool calls handled internally)
         """
+        # Answer from the semantic cache when a near-identical query was seen
+        cache_embedding = None
+        if self.semantic_cache is not None:
+            cache_embedding = await asyncio.to_thread(
+                self.semantic_cache.embed, self._cache_key_text(system_prompt, query)
+            )
+            cached_response = self.semantic_cache.get(cache_embedding, model=model)
+            if cached_response is not None:
+                self.conversation_manager.add_user_message(query)
+                self.conversation_manager.add_assistant_message(cached_response)
+                return cached_response
+
         # Add user message to conversation
         self.conversation_manager.add_user_message(query)
 
@@ -478,7 +1137,7 @@ class QueryProcessor:
 
         # Enhance system prompt with information about tool call limits
         enhanced_system_prompt = system_prompt
-        if not "tool call limit" in system_prompt.lower():
+        if _TOOL_CALL_LIMIT_RE.search(system_prompt) is None:
             enhanced_system_prompt = (
                 f"{system_prompt}\n\n"
                 f"You can make up to {self.response_processor.max_tool_calls} tool calls. "
@@ -503,63 +1162,107 @@ class QueryProcessor:
             response, self.anthropic, enhanced_system_prompt, model, max_tokens
         )
 
+        if cache_embedding is not None and final_response:
+            self.semantic_cache.put(cache_embedding, final_response, model=model)
+
+        # Keep the history sent on the next turn bounded
+        await self.conversation_manager.summarize_history()
+
         return final_response
 
+    async def process_queries_batch(
+        self,
+        system_prompt: str,
+        queries: List[str],
+        model: str = settings.default_model,
+        max_tokens: int = settings.max_tokens,
+        max_concurrent: int = 10,
+    ) -> List[str]:
+        """
+        Process independent queries concurrently, each in a fresh conversation.
+
+        Args:
+            system_prompt: System prompt for Claude
+            queries: User queries to process
+            model: Claude model to use
+            max_tokens: Maximum tokens for each response
+            max_concurrent: Maximum number of queries in flight at once
+
+        Returns:
+            Final text responses, in the same order as queries
+        """
+        sem = asyncio.Semaphore(max_concurrent)
+
+        async def run(query: str) -> str:
+            processor = QueryProcessor(
+                self.anthropic,
+                self.tool_manager.available_tools,
+                self.tool_manager.tool_servers,
+                max_tool_calls=self.response_processor.max_tool_calls,
+                tool_overrides=self.tool_overrides,
+                max_concurrent_tools=self.tool_manager.max_concurrent_tools,
+                semantic_cache=self.semantic_cache,
+                tool_result_cache=self.tool_manager.result_cache,
+            )
+            async with sem:
+                return await processor.process_query(
+                    system_prompt, query, model, max_tokens
+                )
+
+        return list(await asyncio.gather(*(run(query) for query in queries)))
+
+    def _cache_key_text(
+        self, system_prompt: str, query: str, history_turns: int = 4
+    ) -> str:
+        """Build the text embedded for semantic cache lookups."""
+        recent = [
+            f"{message['role']}: {message['content']}"
+            for message in self.conversation_manager.get_history()[-history_turns:]
+            if isinstance(message["content"], str)
+        ]
+        return "\n".join([system_prompt, *recent, f"user: {query}"])
+
     async def _make_initial_api_call(
-        self, system_prompt: str, model: str, clean_tools: List[Dict], max_tokens: int
+        self,
+        system_prompt: str,
+        model: str,
+        clean_tools: Sequence[Dict],
+        max_tokens: int,
     ):
         """Make the initial API call to Claude."""
-        messages = self.conversation_manager.get_messages()
+        messages = self.conversation_manager._messages_view()
 
-        logger.info(f"Making API call to Anthropic with model: {model}")
-        logger.info(f"Number of available tools: {len(clean_tools)}")
-        if clean_tools:
-            logger.debug(f"Tool names: {[tool['name'] for tool in clean_tools]}")
+        logger.info("Making API call to Anthropic with model: %s", model)
+        logger.info("Number of available tools: %d", len(clean_tools))
+        if clean_tools and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Tool names: %s", [tool["name"] for tool in clean_tools])
         
         # Log the API request if in debug mode
         if DEBUG:
-            api_request = {
-                "request": {
-                    "model": model,
-                    "system": system_prompt,
-                    "max_tokens": max_tokens,
-                    "messages": messages,
-                    "tools": clean_tools
-                }
-            }
-            log_message_to_file(api_request)
-
-        response = self.anthropic.messages.create(
-            model=model,
-            system=system_prompt,
-            max_tokens=max_tokens,
-            messages=messages,
-            tools=clean_tools,
-        )
+            self.response_processor.log_request(
+                "request", model, max_tokens, system_prompt, clean_tools
+            )
+
+        # Stream the response, starting each tool call as soon as its block is
+        # complete so tool execution overlaps the rest of the generation
+        try:
+            response = await _stream_message(
+                self.anthropic,
+                on_tool_use=self.response_processor.start_tool_call,
+                model=model,
+                system=_system_blocks(system_prompt),
+                max_tokens=max_tokens,
+                messages=_apply_cache_control(messages),
+                tools=clean_tools,
+            )
+        except Exception:
+            self.response_processor.cancel_started_tool_calls()
+            raise
 
         # Log the API response if in debug mode
         if DEBUG:
             try:
-                # Create a simplified version of the response for logging
-                response_dict = {
-                    "response": {
-                        "id": response.id,
-                        "model": response.model,
-                        "content": [
-                            {
-                                "type": item.type,
-                                "text": item.text if hasattr(item, "text") else None,
-                                "tool_use": {
-                                    "id": item.id,
-                                    "name": item.name,
-                                    "input": item.input
-                                } if hasattr(item, "name") else None
-                            }
-                            for item in response.content
-                        ]
-                    }
-                }
-                log_message_to_file(response_dict)
+                log_message_to_file({"response": _response_for_log(response)})
             except Exception as e:
                 logger.error(f"Error logging API response: {str(e)}")
 
@@ -579,6 +1282,9 @@ async def process_query_simple(
     conversation_history: Optional[List[Dict]] = None,
     max_tool_calls: int = settings.max_tool_calls,
     tool_overrides: Optional[List[ToolOverride]] = None,
+    semantic_cache: Optional[SemanticCacheProtocol] = None,
+    summary_client=None,
+    tool_result_cache: Optional[ToolResultCache] = None,
 ) -> tuple[str, List[Dict]]:
     """
     Simple function interface for processing queries.
@@ -593,6 +1299,10 @@ async def process_query_simple(
         max_tokens: Maximum tokens for response
         conversation_history: Optional existing conversation history
         max_tool_calls: Maximum number of tool calls to make (default: 5)
+        tool_overrides: Optional server/tool description overrides
+        semantic_cache: Optional cache answering near-duplicate queries without an API call
+        summary_client: Optional Anthropic client used to summarize old history
+        tool_result_cache: Optional tool result cache shared across queries
 
     Returns:
         (response_text, updated_conversation_history)
@@ -604,6 +1314,9 @@ async def process_query_simple(
         conversation_history,
         max_tool_calls,
         tool_overrides or [],
+        semantic_cache=semantic_cache,
+        summary_client=summary_client,
+        tool_result_cache=tool_result_cache,
     )
     response = await processor.process_query(system_prompt, query, model, max_tokens)
     return response, processor.get_conversation_history()
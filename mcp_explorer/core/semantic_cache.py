@@ -0,0 +1,122 @@
+"""
+Semantic Cache Module
+
+Caches final LLM responses keyed by an embedding of the conversation context,
+so near-duplicate queries can be answered without another API round-trip.
+
+Requires the optional ``numpy`` and ``sentence-transformers`` packages, installed
+with the ``semantic-cache`` extra.
+"""
+
+import importlib.util
+import logging
+from typing import Any, Callable, List, Optional
+
+from mcp_explorer.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+_MISSING_DEPS = (
+    "The semantic cache needs numpy and sentence-transformers. Install them with "
+    "`pip install 'mcp-explorer[semantic-cache]'` or set SEMANTIC_CACHE=false."
+)
+
+
+class SemanticCache:
+    """Embedding-keyed response cache searched by cosine similarity."""
+
+    def __init__(
+        self,
+        embed: Optional[Callable[[str], Any]] = None,
+        threshold: float = settings.semantic_cache_threshold,
+        max_entries: int = 1024,
+    ):
+        """
+        Initialize an empty cache.
+
+        Args:
+            embed: Function mapping text to a 1-D vector; defaults to a local
+                sentence-transformers model, loaded on first use
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Oldest entries are evicted beyond this size
+
+        Raises:
+            ImportError: If numpy, or sentence-transformers when embed is omitted,
+                is not installed
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError(_MISSING_DEPS) from e
+        if embed is None and importlib.util.find_spec("sentence_transformers") is None:
+            raise ImportError(_MISSING_DEPS)
+
+        self._np = np
+        self._embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._vectors: List[Any] = []
+        self._responses: List[str] = []
+        # Model that produced each response; lookups only match the same model
+        self._models: List[Optional[str]] = []
+        # Stacked float32 matrix of _vectors and array of _models, rebuilt lazily
+        # after a put()
+        self._matrix = None
+        self._model_array = None
+
+    def embed(self, text: str):
+        """Return the unit-length float32 embedding of the given text."""
+        if self._embed is None:
+            from sentence_transformers import SentenceTransformer
+
+            logger.info("Loading embedding model %s", DEFAULT_EMBEDDING_MODEL)
+            self._embed = SentenceTransformer(DEFAULT_EMBEDDING_MODEL).encode
+
+        vector = self._np.asarray(self._embed(text), dtype=self._np.float32)
+        norm = self._np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(
+        self,
+        embedding,
+        threshold: Optional[float] = None,
+        model: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Return the cached response most similar to the embedding, if close enough.
+
+        Only responses stored for the same model are considered.
+        """
+        if not self._vectors:
+            return None
+        if self._matrix is None:
+            self._matrix = self._np.stack(self._vectors)
+            self._model_array = self._np.array(self._models, dtype=object)
+
+        # Rows are unit vectors, so one matrix-vector product gives all cosines
+        scores = self._np.where(
+            self._model_array == model, self._matrix @ embedding, -self._np.inf
+        )
+        best = int(scores.argmax())
+        if scores[best] < (self.threshold if threshold is None else threshold):
+            return None
+        logger.debug("Semantic cache hit (similarity %.3f)", scores[best])
+        return self._responses[best]
+
+    def put(self, embedding, response: str, model: Optional[str] = None) -> None:
+        """Store a response from the given model under the embedding."""
+        self._vectors.append(embedding)
+        self._responses.append(response)
+        self._models.append(model)
+        if len(self._vectors) > self.max_entries:
+            del self._vectors[0], self._responses[0], self._models[0]
+        self._matrix = None
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._vectors.clear()
+        self._responses.clear()
+        self._models.clear()
+        self._matrix = None
@@ -1,8 +1,13 @@
 from .base import MCPServerConnection
 from .sse import SSEServerConnection
-from .stdio import STDIOServerConnection
+from .stdio import STDIOServerConnection, STDIOSpawnPool
 
-__all__ = ["MCPServerConnection", "SSEServerConnection", "STDIOServerConnection"]
+__all__ = [
+    "MCPServerConnection",
+    "SSEServerConnection",
+    "STDIOServerConnection",
+    "STDIOSpawnPool",
+]
 
 # Add a function to create a test STDIO server file
 def create_test_stdio_server(filename="test_stdio_server.py"):
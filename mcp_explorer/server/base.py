@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import Dict, Any, Sequence
 
 
 class MCPServerConnection(ABC):
@@ -16,8 +16,8 @@ class MCPServerConnection(ABC):
         pass
 
     @abstractmethod
-    async def list_tools(self) -> List[Dict[str, Any]]:
-        """List available tools from the server"""
+    async def list_tools(self, force_refresh: bool = False) -> Sequence[Dict[str, Any]]:
+        """List available tools from the server, cached unless force_refresh"""
         pass
 
     @abstractmethod
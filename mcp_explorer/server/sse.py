@@ -1,8 +1,32 @@
-from typing import List, Dict, Any
+import logging
+from typing import Dict, Any, Sequence, Tuple
 from mcp import ClientSession
 from mcp.client.sse import sse_client
 from .base import MCPServerConnection
 
+logger = logging.getLogger("sse_server")
+
+
+def _convert_tools(tools) -> Tuple[Dict[str, Any], ...]:
+    """Convert MCP Tool objects to the tool dicts used by the client"""
+    return tuple(
+        {
+            "name": tool.name,
+            "description": tool.description,
+            "input_schema": tool.inputSchema,
+            "cacheable": _has_hint(tool.annotations, "readOnlyHint"),
+            "idempotent": _has_hint(tool.annotations, "readOnlyHint", "idempotentHint"),
+        }
+        for tool in tools
+    )
+
+
+def _has_hint(annotations, *hints: str) -> bool:
+    """Whether a tool's annotations set any of the given hints."""
+    if annotations is None:
+        return False
+    return any(getattr(annotations, hint, None) for hint in hints)
+
 
 class SSEServerConnection(MCPServerConnection):
     """Implementation of MCP server connection using SSE transport"""
@@ -11,7 +35,7 @@ class SSEServerConnection(MCPServerConnection):
         self.session = None
         self.streams_context = None
         self.session_context = None
-        self.tools = []
+        self.tools: Sequence[Dict[str, Any]] = ()
         self._connected = False
 
     async def connect(self, server_url: str) -> bool:
@@ -29,19 +53,12 @@ class SSEServerConnection(MCPServerConnection):
 
             # List available tools to verify connection
             response = await self.session.list_tools()
-            self.tools = [
-                {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "input_schema": tool.inputSchema,
-                }
-                for tool in response.tools
-            ]
+            self.tools = _convert_tools(response.tools)
 
             self._connected = True
             return True
         except Exception as e:
-            print(f"Error connecting to SSE server: {str(e)}")
+            logger.exception("Error connecting to SSE server: %s", e)
             self._connected = False
             return False
 
@@ -54,26 +71,27 @@ class SSEServerConnection(MCPServerConnection):
                 await self.streams_context.__aexit__(None, None, None)
             self._connected = False
         except Exception as e:
-            print(f"Error disconnecting from SSE server: {str(e)}")
+            logger.exception("Error disconnecting from SSE server: %s", e)
+
+    async def list_tools(self, force_refresh: bool = False) -> Sequence[Dict[str, Any]]:
+        """
+        List available tools from the server
 
-    async def list_tools(self) -> List[Dict[str, Any]]:
-        """List available tools from the server"""
+        Returns the tools fetched on connect unless force_refresh is set. The
+        result is shared between callers and must not be mutated.
+        """
         if not self.is_connected:
             raise Exception("Not connected to server")
 
+        if self.tools and not force_refresh:
+            return self.tools
+
         try:
             response = await self.session.list_tools()
-            self.tools = [
-                {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "input_schema": tool.inputSchema,
-                }
-                for tool in response.tools
-            ]
+            self.tools = _convert_tools(response.tools)
             return self.tools
         except Exception as e:
-            print(f"Error listing tools: {str(e)}")
+            logger.error("Error listing tools: %s", e)
             raise
 
     async def call_tool(self, tool_name: str, tool_args: Dict[str, Any]) -> Any:
@@ -84,7 +102,7 @@ class SSEServerConnection(MCPServerConnection):
         try:
             return await self.session.call_tool(tool_name, tool_args)
         except Exception as e:
-            print(f"Error calling tool {tool_name}: {str(e)}")
+            logger.error("Error calling tool %s: %s", tool_name, e)
             raise
 
     @property
@@ -1,68 +1,302 @@
 import asyncio
+import functools
+import itertools
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import shlex
+import subprocess
+import sys
+import time
+import types
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from mcp.types import CallToolResult
 import os
+import re
 
 
 from .base import MCPServerConnection
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 logger = logging.getLogger("stdio_server")
 
+# Characters that need a real shell to interpret: pipes, redirects, expansion and
+# substitution, grouping, comments, backslash escapes and line continuations,
+# globs, and ~
+SHELL_METACHARACTERS = frozenset("|&;<>$`()#\\\n*?[~")
+
+# A leading NAME=value word, which sh treats as an environment assignment
+_ASSIGNMENT_RE = re.compile(r"\s*[A-Za-z_]\w*=")
+
+# Size of each read from the subprocess pipes; lines are split out in Python
+READ_CHUNK_SIZE = 64 * 1024
+
+# StreamReader buffer limit; reading pauses only once this much is unread
+STREAM_LIMIT = 4 * 1024 * 1024
+
+# Kernel pipe capacity requested for the server's stdin and stdout (Linux)
+PIPE_BUFFER_SIZE = 1024 * 1024
+F_SETPIPE_SZ = getattr(fcntl, "F_SETPIPE_SZ", 1031)
+
+# Outgoing frames waiting for the writer task; senders block once it is full
+WRITE_QUEUE_SIZE = 1024
+
+# Most frames written to stdin between two drain() calls
+WRITE_BATCH_SIZE = 64
+
+# Snapshot of the process environment, taken once instead of on every connect
+_ENV_SNAPSHOT = types.MappingProxyType(dict(os.environ))
+
+
+def _encode_frame(payload: Dict[str, Any]) -> bytes:
+    """Serialize a JSON-RPC message as one newline-terminated line, without spaces."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(payload, separators=(",", ":")).encode() + b"\n"
+
+
+def _decode_frame(line: bytes) -> Any:
+    """Parse one JSON-RPC line read from the server."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+# Notifications sent on every connect/disconnect, encoded once
+_INITIALIZED_FRAME = _encode_frame(
+    {"jsonrpc": "2.0", "method": "notifications/initialized", "params": {}}
+)
+_TERMINATE_FRAME = _encode_frame(
+    {"jsonrpc": "2.0", "method": "terminate", "params": {}}
+)
+
+
+def _convert_tools(tools: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], ...]:
+    """Convert raw MCP tool definitions (camelCase) to the client's tool dicts."""
+    return tuple(
+        {
+            "name": tool.get("name"),
+            "description": tool.get("description"),
+            "input_schema": tool.get("inputSchema", {}),
+            "cacheable": _has_hint(tool.get("annotations"), "readOnlyHint"),
+            "idempotent": _has_hint(
+                tool.get("annotations"), "readOnlyHint", "idempotentHint"
+            ),
+        }
+        for tool in tools
+    )
+
+
+def _has_hint(annotations: Optional[Dict[str, Any]], *hints: str) -> bool:
+    """Whether a tool's annotations set any of the given hints."""
+    if not isinstance(annotations, dict):
+        return False
+    return any(annotations.get(hint) for hint in hints)
+
+
+def _split_lines(buffer: bytearray, chunk: bytes) -> List[bytearray]:
+    """
+    Add a chunk read from a pipe to buffer and return the complete lines.
+
+    Only the new chunk is searched for a newline, so a long line arriving over
+    many reads is not rescanned each time.
+    """
+    end = chunk.rfind(b"\n")
+    if end < 0:
+        buffer.extend(chunk)
+        return []
+    buffer.extend(memoryview(chunk)[:end])
+    lines = buffer.split(b"\n")
+    buffer[:] = memoryview(chunk)[end + 1 :]
+    return lines
+
+
+def _enlarge_pipes(popen: subprocess.Popen) -> None:
+    """Best effort: raise the kernel buffer of the server's stdin/stdout pipes."""
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return
+    for pipe in (popen.stdin, popen.stdout):
+        try:
+            fcntl.fcntl(pipe.fileno(), F_SETPIPE_SZ, PIPE_BUFFER_SIZE)
+        except (AttributeError, OSError) as e:
+            logger.debug("Could not resize pipe: %s", e)
+
+
+class _PipedProcess:
+    """
+    The parts of asyncio.subprocess.Process used here, for a Popen started in a
+    worker thread whose pipes were then attached to the event loop.
+    """
+
+    def __init__(self, popen, stdin, stdout, stderr):
+        self._popen = popen
+        self.stdin = stdin
+        self.stdout = stdout
+        self.stderr = stderr
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self._popen.poll()
+
+    async def wait(self) -> int:
+        while self._popen.poll() is None:
+            await asyncio.sleep(0.05)
+        return self._popen.returncode
+
+    def kill(self) -> None:
+        self._popen.kill()
+
+
+async def _spawn(args, shell: bool, env: Dict[str, str]):
+    """
+    Start the server with piped stdin, stdout and stderr.
+
+    asyncio's own subprocess functions fork and exec on the event loop thread,
+    which stalls every other coroutine while several servers start at once. On
+    POSIX the Popen call runs in a worker thread instead and its pipes are then
+    wrapped in asyncio streams; elsewhere the asyncio functions are used.
+    """
+    if sys.platform == "win32":
+        create = (
+            asyncio.create_subprocess_shell if shell else asyncio.create_subprocess_exec
+        )
+        return await create(
+            *([args] if shell else args),
+            limit=STREAM_LIMIT,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+        )
+
+    def start() -> subprocess.Popen:
+        popen = subprocess.Popen(
+            args,
+            shell=shell,
+            bufsize=0,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+        )
+        _enlarge_pipes(popen)
+        return popen
+
+    popen = await asyncio.to_thread(start)
+    loop = asyncio.get_running_loop()
+    try:
+        readers = []
+        for pipe in (popen.stdout, popen.stderr):
+            reader = asyncio.StreamReader(limit=STREAM_LIMIT, loop=loop)
+            await loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(reader, loop=loop), pipe
+            )
+            readers.append(reader)
+        transport, protocol = await loop.connect_write_pipe(
+            lambda: asyncio.StreamReaderProtocol(asyncio.StreamReader(), loop=loop),
+            popen.stdin,
+        )
+    except BaseException:
+        popen.kill()
+        raise
+    stdin = asyncio.StreamWriter(transport, protocol, None, loop)
+    return _PipedProcess(popen, stdin, *readers)
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_cmd(command: str) -> Tuple[str, ...]:
+    """Split a command line into words, honouring shell quoting."""
+    return tuple(shlex.split(command))
+
+
+def _exec_args(command: str) -> Optional[List[str]]:
+    """
+    Split a server command into exec arguments.
+
+    Returns None if the command needs a real shell: anything involving
+    expansion, substitution, redirection, escapes, globs or leading variable
+    assignments. Only plain words, optionally quoted, are exec'd directly.
+    """
+    if SHELL_METACHARACTERS.intersection(command) or _ASSIGNMENT_RE.match(command):
+        return None
+    return list(_parse_cmd(command))
+
+
+def _pool_key(
+    server_url: str,
+    api_keys: Optional[Dict[str, Any]],
+    environment_variables: Optional[Dict[str, str]],
+) -> Tuple:
+    """Identify servers that are interchangeable: same command, same environment."""
+
+    def freeze(mapping) -> frozenset:
+        if not isinstance(mapping, dict):
+            return frozenset()
+        return frozenset((key, str(val)) for key, val in mapping.items())
+
+    return server_url, freeze(api_keys), freeze(environment_variables)
+
+
+def refresh_env_snapshot() -> None:
+    """Re-read os.environ, e.g. after it was modified at runtime or in tests."""
+    global _ENV_SNAPSHOT
+    _ENV_SNAPSHOT = types.MappingProxyType(dict(os.environ))
+
 
 class STDIOServerConnection(MCPServerConnection):
+    """
+    MCP server connection over a subprocess's stdin/stdout (JSON-RPC 2.0).
+
+    Requests are pipelined: each registers a future in _pending_requests and a
+    single reader task resolves it by id, so concurrent call_tool invocations
+    are all in flight at once rather than waiting on each other.
+    """
+
     def __init__(self):
         self._process = None
         self._connected = False
-        self._request_id = 0
+        # Bound __next__ of a counter: a C-level call that yields 1, 2, 3, ...
+        self._next_id = itertools.count(1).__next__
+        self._stdout_buffer = bytearray()
+        # Requests awaiting a response, by JSON-RPC id; resolved by _reader_loop
+        self._pending_requests: Dict[int, asyncio.Future] = {}
+        self._reader_task: Optional[asyncio.Task] = None
+        # Encoded frames for _writer_loop, which writes them to stdin in batches
+        self._send_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
         self.tools = []
-
-    # Helper function to create environment variables for subprocess
+        # Converted tool list returned by list_tools; None until fetched or after
+        # the server reports that its tools changed
+        self._tools_view: Optional[Tuple[Dict[str, Any], ...]] = None
+        # Set when the connection came from a STDIOSpawnPool, which takes it
+        # back on disconnect
+        self._pool: Optional["STDIOSpawnPool"] = None
+        self._pool_key: Optional[Tuple] = None
+        self._pool_args: Optional[Tuple] = None
 
     def create_env(self, additional_vars=None):
         """
-        Create a subprocess environment, merging the current environment with any additional_vars.
+        Create a subprocess environment, merging the cached environment snapshot with any additional_vars.
         Expand shell-style variables and user home in provided variable values.
         """
-        env = os.environ.copy()
-        if additional_vars:
-            for key, val in additional_vars.items():
-                env[key] = os.path.expanduser(os.path.expandvars(val))
-        return env
+        if not additional_vars:
+            return dict(_ENV_SNAPSHOT)
+        return {
+            **_ENV_SNAPSHOT,
+            **{
+                key: os.path.expanduser(os.path.expandvars(val))
+                for key, val in additional_vars.items()
+            },
+        }
 
-    """
-    def create_env(self, additional_vars=None):
-
-        # Essential system variables that are usually safe to pass
-        safe_system_vars = [
-            "PATH",
-            "HOME",
-            "USER",
-            "SHELL",
-            "TERM",
-            "LANG",
-            "LC_ALL",
-            "TZ",
-            "PWD",
-            "TMPDIR",
-            "TEMP",
-            "TMP",
-        ]
-
-        env = {}
-
-        # Add safe system variables
-        for var in safe_system_vars:
-            if var in os.environ:
-                env[var] = os.environ[var]
-
-        # Add your specific variables
-        if additional_vars:
-            env.update(additional_vars)
-
-        return env
-    """
 
     async def connect(
         self,
@@ -71,24 +305,28 @@ class STDIOServerConnection(MCPServerConnection):
         environment_variables: Dict[str, str] | None = None,
     ) -> bool:
         try:
-            # Launch the command via shell to support complex invocations (e.g. docker run with escapes)
-            logger.info(f"Starting STDIO server with shell command: {server_url}")
             # Combine API keys and environment variables into subprocess env
             additional_vars: dict[str, str] = {}
             if api_keys:
                 additional_vars.update({k: str(v) for k, v in api_keys.items()})
             if environment_variables:
                 additional_vars.update(environment_variables)
-            self._process = await asyncio.create_subprocess_shell(
-                server_url,
-                limit=1024 * 128,  # 128 KiB buffer
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=self.create_env(additional_vars),
-            )
+            env = self.create_env(additional_vars)
+            self._stdout_buffer.clear()
+
+            # Exec the command directly unless it needs shell features, which
+            # saves forking an intermediate /bin/sh for every server
+            cmd_parts = _exec_args(server_url)
+            if cmd_parts is None:
+                logger.info("Starting STDIO server with shell command: %s", server_url)
+                self._process = await _spawn(server_url, shell=True, env=env)
+            else:
+                logger.info("Starting STDIO server with command: %s", cmd_parts)
+                self._process = await _spawn(cmd_parts, shell=False, env=env)
 
-            asyncio.create_task(self._log_stderr())
+            self._reader_task = asyncio.create_task(self._reader_loop())
+            self._send_queue = asyncio.Queue(WRITE_QUEUE_SIZE)
+            self._writer_task = asyncio.create_task(self._writer_loop())
 
             # Step 1: Initialize
             result = await self._send_request(
@@ -113,34 +351,27 @@ class STDIOServerConnection(MCPServerConnection):
                 return False
 
             # Step 2: Initialized notification
-            await self._send_notification("notifications/initialized", {})
-
-            # Step 3: List tools (unwrap the JSON-RPC envelope)
-            tools_result = await self._send_request(
-                {
-                    "jsonrpc": "2.0",
-                    "method": "tools/list",
-                    "params": {},
-                    "id": self._next_id(),
-                }
-            )
-            body = (
-                tools_result.get("result") if isinstance(tools_result, dict) else None
-            )
-            if isinstance(body, dict) and "tools" in body:
-                self.tools = body["tools"]
-            elif isinstance(body, list):
-                self.tools = body
-            else:
-                logger.warning("Unexpected tools/list result format: %s", body)
+            await self._send_raw(_INITIALIZED_FRAME)
+
+            # Step 3: List tools. A server that advertises the tools capability
+            # has answered initialize already, so the list is left to the first
+            # list_tools() call instead of costing another round trip here.
+            body = result.get("result") if isinstance(result, dict) else None
+            capabilities = body.get("capabilities") if isinstance(body, dict) else None
+            if isinstance(capabilities, dict) and isinstance(
+                capabilities.get("tools"), dict
+            ):
                 self.tools = []
+                self._tools_view = None
+            else:
+                await self._fetch_tools()
+                logger.info("Found %d tools.", len(self.tools))
 
-            logger.info(f"Found {len(self.tools)} tools.")
             self._connected = True
             return True
 
         except Exception as e:
-            logger.error(f"Failed to connect: {e}")
+            logger.error("Failed to connect: %s", e)
             await self.disconnect()
             return False
 
@@ -151,43 +382,65 @@ class STDIOServerConnection(MCPServerConnection):
             not self._process
             or not self._process.stdin
             or self._process.stdin.is_closing()
+            or self._send_queue is None
         ):
             logger.error("Process not available for request.")
             return None
 
+        # Only wait for response if ID is present; the future is registered
+        # before writing so a fast reply cannot arrive ahead of it
+        request_id = payload.get("id")
+        future = None
+        if request_id is not None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending_requests[request_id] = future
+
         try:
-            message = json.dumps(payload) + "\n"
-            logger.info(f"Sending request: {message.strip()}")
-            self._process.stdin.write(message.encode())
-            await self._process.stdin.drain()
+            await self._send_raw(_encode_frame(payload))
 
-            # Only wait for response if ID is present
-            if "id" not in payload:
+            if future is None:
                 return None
 
-            line = await asyncio.wait_for(self._process.stdout.readline(), timeout)
-            response_str = line.decode().strip()
-            logger.info(f"Received response: {response_str}")
-            return json.loads(response_str)
+            return await asyncio.wait_for(future, timeout)
 
         except asyncio.TimeoutError:
             logger.error(
-                f"Timeout waiting for response to method '{payload.get('method')}'"
+                "Timeout waiting for response to method '%s'", payload.get("method")
             )
         except Exception as e:
-            logger.error(f"Request error: {e}")
+            logger.error("Request error: %s", e)
+        finally:
+            if request_id is not None:
+                self._pending_requests.pop(request_id, None)
 
         return None
 
-    async def _send_notification(self, method: str, params: Dict[str, Any]) -> None:
-        payload = {"jsonrpc": "2.0", "method": method, "params": params}
-        await self._send_request(payload)
+    async def _send_raw(self, frame: bytes) -> None:
+        """Queue an already encoded frame for the writer task."""
+        if self._send_queue is None:
+            raise ConnectionError("Process not available for request.")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sending request: %s", frame.decode().strip())
+        await self._send_queue.put(frame)
+
+    async def list_tools(self, force_refresh: bool = False) -> Sequence[Dict[str, Any]]:
+        """
+        List available tools from the server.
 
-    async def list_tools(self) -> List[Dict[str, Any]]:
-        """List available tools from the server."""
+        The list is fetched once, on connect or on first use, and reused until
+        the server reports a change or force_refresh is set. It is shared
+        between callers and must not be mutated.
+        """
         if not self._connected:
             raise Exception("Not connected to server.")
 
+        if self._tools_view is not None and not force_refresh:
+            return self._tools_view
+
+        return await self._fetch_tools()
+
+    async def _fetch_tools(self) -> Sequence[Dict[str, Any]]:
+        """Request tools/list and cache the converted result."""
         response = await self._send_request(
             {
                 "jsonrpc": "2.0",
@@ -197,6 +450,7 @@ class STDIOServerConnection(MCPServerConnection):
             }
         )
 
+        # Unwrap the JSON-RPC envelope
         result = response.get("result") if response else None
 
         raw_tools = []
@@ -207,17 +461,9 @@ class STDIOServerConnection(MCPServerConnection):
         else:
             logger.warning("Unexpected format from tools/list result: %s", result)
 
-        # Convert camelCase to snake_case for consistency
-        self.tools = [
-            {
-                "name": tool.get("name"),
-                "description": tool.get("description"),
-                "input_schema": tool.get("inputSchema", {}),
-            }
-            for tool in raw_tools
-        ]
-
-        return self.tools
+        self.tools = raw_tools
+        self._tools_view = _convert_tools(raw_tools)
+        return self._tools_view
 
     async def call_tool(
         self, tool_name: str, tool_args: Dict[str, Any]
@@ -241,15 +487,28 @@ class STDIOServerConnection(MCPServerConnection):
         return CallToolResult(**response["result"])
 
     async def disconnect(self) -> None:
+        # Pooled servers stay running for the next connect while the pool has room
+        if self._pool is not None and self._pool.release(self):
+            logger.info("Returned server to the spawn pool.")
+            return
+        await self._close()
+
+    async def _close(self) -> None:
+        """Shut the server down and reset the connection."""
         logger.info("Disconnecting...")
 
         if self._process:
             if self._process.stdin and not self._process.stdin.is_closing():
                 try:
                     # send the JSON-RPC terminate message to allow graceful shutdown
-                    await self._send_notification("terminate", {})
+                    await self._send_raw(_TERMINATE_FRAME)
                 except Exception:
                     pass
+                # Let the writer flush queued frames before stdin is closed
+                try:
+                    await asyncio.wait_for(self._send_queue.join(), timeout=1)
+                except (asyncio.TimeoutError, AttributeError):
+                    pass
                 self._process.stdin.close()
 
             try:
@@ -259,23 +518,291 @@ class STDIOServerConnection(MCPServerConnection):
                 self._process.kill()
                 await self._process.wait()
 
+        if self._reader_task:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._writer_task:
+            self._writer_task.cancel()
+            self._writer_task = None
+        self._send_queue = None
+        self._fail_pending_requests(ConnectionError("Disconnected from server"))
+
         self._process = None
         self._connected = False
+        self._tools_view = None
         logger.info("Disconnected.")
 
-    async def _log_stderr(self):
-        if not self._process or not self._process.stderr:
+    async def _reader_loop(self) -> None:
+        """
+        Read the server's stdout and stderr for the lifetime of the connection.
+
+        One task waits on both pipes and handles whichever has data first. Each
+        response resolves the future of the request with the same id, so any
+        number of requests can be in flight at once.
+        """
+        stdout = self._process.stdout
+        stderr = self._process.stderr
+        buffers = {stdout: self._stdout_buffer, stderr: bytearray()}
+        reads: Dict[asyncio.Future, asyncio.StreamReader] = {}
+
+        def start_read(stream: asyncio.StreamReader) -> None:
+            reads[asyncio.ensure_future(stream.read(READ_CHUNK_SIZE))] = stream
+
+        start_read(stdout)
+        start_read(stderr)
+
+        try:
+            while reads:
+                done, _ = await asyncio.wait(
+                    reads, return_when=asyncio.FIRST_COMPLETED
+                )
+                for read in done:
+                    stream = reads.pop(read)
+                    chunk = read.result()
+                    buffer = buffers[stream]
+                    if chunk:
+                        lines = _split_lines(buffer, chunk)
+                        start_read(stream)
+                    else:
+                        # EOF: whatever is left is the final, unterminated line
+                        lines = [bytes(buffer)]
+                        buffer.clear()
+
+                    for line in lines:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        # JSON-RPC frames are objects; anything else is log output
+                        # (some servers print diagnostics to stdout)
+                        if stream is stdout and line.startswith(b"{"):
+                            self._handle_frame(line)
+                        else:
+                            logger.warning(
+                                "%s: %s",
+                                "STDOUT" if stream is stdout else "STDERR",
+                                line.decode(errors="replace"),
+                            )
+
+                    if stream is stdout and not chunk:
+                        self._fail_pending_requests(
+                            ConnectionError("Server closed the connection")
+                        )
+        except Exception as e:
+            logger.exception("Error reading from server: %s", e)
+        finally:
+            for read in reads:
+                read.cancel()
+            self._fail_pending_requests(ConnectionError("Server closed the connection"))
+
+    async def _writer_loop(self) -> None:
+        """
+        Write queued frames to the server's stdin for the lifetime of the connection.
+
+        Every frame already queued is written in one writelines() call followed by
+        a single drain(), so a burst of concurrent requests costs one flush rather
+        than one per message.
+        """
+        queue = self._send_queue
+        stdin = self._process.stdin
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < WRITE_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                stdin.writelines(batch)
+                await stdin.drain()
+            except Exception as e:
+                logger.error("Error writing to server: %s", e)
+                self._fail_pending_requests(ConnectionError("Server stdin closed"))
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _handle_frame(self, line: bytes) -> None:
+        """Dispatch one JSON-RPC frame to its waiting request or to a handler."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received message: %s", line.decode())
+        try:
+            message = _decode_frame(line)
+        except ValueError as e:
+            logger.warning("Invalid JSON from server: %s", e)
+            return
+        if not isinstance(message, dict):
             return
 
-        while not self._process.stderr.at_eof():
-            line = await self._process.stderr.readline()
-            if line:
-                logger.warning(f"STDERR: {line.decode().rstrip()}")
+        request_id = message.get("id")
+        # Requests and notifications from the server carry a method; responses
+        # never do, and only they may resolve one of our pending requests
+        if "method" in message:
+            if request_id is None:
+                self._handle_notification(message)
+            else:
+                self._handle_server_request(message)
+            return
+        if request_id is None:
+            return
+        if isinstance(request_id, str) and request_id.isdigit():
+            request_id = int(request_id)
+        # Responses to requests that already timed out are dropped here
+        future = self._pending_requests.pop(request_id, None)
+        if future is not None and not future.done():
+            future.set_result(message)
+
+    def _fail_pending_requests(self, error: Exception) -> None:
+        """Fail every request still waiting for a response."""
+        for future in self._pending_requests.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending_requests.clear()
+
+    def _handle_server_request(self, message: Dict[str, Any]) -> None:
+        """Answer a request sent by the server; only ping is supported."""
+        response: Dict[str, Any] = {"jsonrpc": "2.0", "id": message["id"]}
+        if message["method"] == "ping":
+            response["result"] = {}
+        else:
+            logger.warning("Unsupported request from server: %s", message["method"])
+            response["error"] = {
+                "code": -32601,
+                "message": f"Method not found: {message['method']}",
+            }
+        if self._send_queue is None:
+            return
+        try:
+            self._send_queue.put_nowait(_encode_frame(response))
+        except asyncio.QueueFull:
+            logger.warning(
+                "Send queue full; dropping response to %s", message["method"]
+            )
 
-    def _next_id(self) -> int:
-        self._request_id += 1
-        return self._request_id
+    def _handle_notification(self, message: Dict[str, Any]) -> None:
+        """React to a notification sent by the server."""
+        if message.get("method") == "notifications/tools/list_changed":
+            logger.info("Server tools changed; refreshing on next list_tools.")
+            self._tools_view = None
 
     @property
     def is_connected(self) -> bool:
         return self._connected and self._process and self._process.returncode is None
+
+
+class STDIOSpawnPool:
+    """
+    Spare STDIO servers, already started and initialized, keyed by command and
+    environment.
+
+    acquire() hands out a spare when one is ready, so reconnecting skips
+    process startup and the MCP handshake. Connections it hands out come back
+    on disconnect() and are only shut down when the pool already holds max_idle
+    spares for their command. Only a command whose server has come back this way
+    gets more spares, started in the background up to size, so a server that
+    stays connected costs no extra processes.
+    Spares left unused for idle_timeout seconds are shut down in the background.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_idle: Optional[int] = None,
+        idle_timeout: float = 300.0,
+    ):
+        self.size = size
+        self.max_idle = size if max_idle is None else max(size, max_idle)
+        self.idle_timeout = idle_timeout
+        # Spares per key as (monotonic time they became idle, connection)
+        self._idle: Dict[Tuple, List[Tuple[float, STDIOServerConnection]]] = {}
+        self._warming: Dict[Tuple, int] = {}
+        self._tasks: set = set()
+        self._reaper: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def acquire(
+        self,
+        server_url: str,
+        api_keys: Dict[str, Any] | None = None,
+        environment_variables: Dict[str, str] | None = None,
+    ) -> Optional[STDIOServerConnection]:
+        """Return a connected server for the command, or None if it fails to start."""
+        args = (server_url, api_keys, environment_variables)
+        key = _pool_key(*args)
+        idle = self._idle.get(key, [])
+        connection = None
+        while idle and connection is None:
+            _, candidate = idle.pop()
+            if candidate.is_connected:
+                connection = candidate
+            else:
+                await candidate._close()
+        if connection is None:
+            connection = await self._start(key, args)
+        if connection is not None and self._reaper is None and self.idle_timeout > 0:
+            self._reaper = asyncio.create_task(self._reap_idle())
+        return connection
+
+    def release(self, connection: STDIOServerConnection) -> bool:
+        """Keep a disconnected server as a spare; False if it should be shut down."""
+        idle = self._idle.setdefault(connection._pool_key, [])
+        if self._closed or not connection.is_connected or len(idle) >= self.max_idle:
+            return False
+        idle.append((time.monotonic(), connection))
+        self._refill(connection._pool_key, connection._pool_args)
+        return True
+
+    async def close(self) -> None:
+        """Shut down every spare, including those still starting."""
+        self._closed = True
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        spares = [connection for idle in self._idle.values() for _, connection in idle]
+        self._idle.clear()
+        await asyncio.gather(*(c._close() for c in spares), return_exceptions=True)
+
+    async def _start(self, key: Tuple, args: Tuple) -> Optional[STDIOServerConnection]:
+        connection = STDIOServerConnection()
+        if not await connection.connect(*args):
+            return None
+        # Spares are handed out ready to use, tool list included
+        await connection.list_tools()
+        connection._pool = self
+        connection._pool_key = key
+        connection._pool_args = args
+        return connection
+
+    def _refill(self, key: Tuple, args: Tuple) -> None:
+        """Start spares in the background until size are ready or starting."""
+        starting = self._warming.get(key, 0)
+        for _ in range(self.size - len(self._idle.get(key, ())) - starting):
+            self._warming[key] = self._warming.get(key, 0) + 1
+            task = asyncio.create_task(self._warm(key, args))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _warm(self, key: Tuple, args: Tuple) -> None:
+        try:
+            connection = await self._start(key, args)
+        finally:
+            self._warming[key] -= 1
+        if connection is None:
+            return
+        if self._closed:
+            await connection._close()
+        else:
+            self._idle.setdefault(key, []).append((time.monotonic(), connection))
+
+    async def _reap_idle(self) -> None:
+        """Periodically shut down spares idle for longer than idle_timeout."""
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 30.0))
+            cutoff = time.monotonic() - self.idle_timeout
+            expired = []
+            for idle in self._idle.values():
+                expired.extend(c for since, c in idle if since < cutoff)
+                idle[:] = [(since, c) for since, c in idle if since >= cutoff]
+            if expired:
+                logger.info("Closing %d idle STDIO servers.", len(expired))
+                await asyncio.gather(
+                    *(c._close() for c in expired), return_exceptions=True
+                )
@@ -6,6 +6,7 @@ Based on feature-encrypted-env-var.md pattern.
 
 import os
 import base64
+import hashlib
 import json
 from rich.prompt import Prompt
 
@@ -18,7 +19,14 @@ b64d = lambda s: base64.urlsafe_b64decode(s.encode())
 
 def derive_key(password: bytes, salt: bytes) -> bytes:
     # Match original scrypt parameters: N=2**15, r=8, p=1
-    return _scrypt(password, salt, 32, N=2**15, r=8, p=1)
+    try:
+        # OpenSSL's scrypt; needs maxmem above the 32 MiB these parameters use
+        return hashlib.scrypt(
+            password, salt=salt, n=2**15, r=8, p=1, dklen=32, maxmem=64 * 1024 * 1024
+        )
+    except (AttributeError, ValueError):
+        # Python built against an OpenSSL without scrypt support
+        return _scrypt(password, salt, 32, N=2**15, r=8, p=1)
 
 
 def load_and_decrypt_env(var_name: str = "ENCRYPTED_API_KEY") -> str:
@@ -2,17 +2,77 @@ from mcp.server.fastmcp import FastMCP
 import os
 import logging
 import sys
+import time
 import datetime
 
 logger = logging.getLogger(__name__)
 
-# Configure logging to stderr
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    stream=sys.stderr,
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that re-runs strftime for asctime only when the second changes."""
+
+    _last_second = None
+    _last_time = ""
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_second = second
+            self._last_time = time.strftime(
+                datefmt or self.default_time_format, self.converter(record.created)
+            )
+        if datefmt:
+            return self._last_time
+        return self.default_msec_format % (self._last_time, record.msecs)
+
+
+# Configure logging to stderr when run as a server; an importing application
+# keeps its own logging setup. This has to run before FastMCP() below, which
+# would otherwise install its own root handler first.
+if __name__ == "__main__":
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(
+        _CachedTimeFormatter("%(asctime)s - %(levelname)s - %(message)s")
+    )
+    logging.basicConfig(level=logging.INFO, handlers=[_handler], force=False)
+
+# The environment is fixed for the life of the server process, so it is read
+# once into a plain dict instead of going through os.environ on every lookup
+_ENV_SNAPSHOT = dict(os.environ)
+_API_KEY = _ENV_SNAPSHOT.get("X-API-KEY", "xxx")
+_NOT_SET = "not set"
+
+
+_date_today = datetime.date.today
+# Month names as strftime("%B") gives them in the C locale, indexed by month
+_MONTHS = (
+    "",
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
 )
 
+# Formatted strings for the current day, recomputed only when the date changes
+_today_cache = {"ord": -1, "date_str": "", "month": ""}
+
+
+def _today_strings() -> dict:
+    d = _date_today()
+    if d.toordinal() != _today_cache["ord"]:
+        _today_cache.update(
+            ord=d.toordinal(), date_str=d.isoformat(), month=_MONTHS[d.month]
+        )
+    return _today_cache
+
 
 # Initialize server
 mcp = FastMCP("my-server")
@@ -20,44 +80,42 @@ mcp = FastMCP("my-server")
 
 # Add a tool
 @mcp.tool()
-async def hello_world(name: str) -> str:
+def hello_world(name: str) -> str:
     """Say hello to someone.
 
     Args:
         name: Person's name
     """
-    import sys
-
-    if os.environ.get("X-API-KEY", "xxx") == "xxx":
+    if _API_KEY == "xxx":
         raise ValueError("X-API-KEY environment variable must be set to a valid value.")
 
-    print(f"Received request with name: {name}", file=sys.stderr)
-    print(f"X-API-KEY: {os.environ.get('X-API-KEY', 'not set')}", file=sys.stderr)
-    return f"Hello, {name}!"
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received request with name: %s", name)
+    return "Hello, " + name + "!"
 
 
 @mcp.tool()
-async def today() -> str:
+def today() -> str:
     """
     Return today's date in yyyyy-mm-dd format.
     """
-    return str(datetime.date.today())
+    return _today_strings()["date_str"]
 
 
 @mcp.tool()
-async def month_in_words() -> str:
+def month_in_words() -> str:
     """
     Return the current month in words.
     """
-    return datetime.date.today().strftime("%B")
+    return _today_strings()["month"]
 
 
 @mcp.tool()
-async def print_env_var(name: str) -> str:
+def print_env_var(name: str) -> str:
     """
     Print the value of an environment variable.
     """
-    return os.environ.get(name, "not set")
+    return _ENV_SNAPSHOT.get(name, _NOT_SET)
 
 
 # Run the server